@@ -21,6 +21,7 @@ CLAUDE_DIR="$HOME/.claude"
 HOOKS_DIR="$CLAUDE_DIR/hooks"
 SETTINGS_FILE="$CLAUDE_DIR/settings.json"
 HOOK_FILE="$HOOKS_DIR/log-user-inputs.py"
+DAEMON_FILE="$HOOKS_DIR/logger_daemon.py"
 
 # Functions
 print_header() {
@@ -101,6 +102,13 @@ install_hook() {
     cp "$SCRIPT_DIR/log-user-inputs.py" "$HOOK_FILE"
     chmod +x "$HOOK_FILE"
     print_success "Hook installed to $HOOK_FILE"
+    
+    # Copy optional background daemon next to the hook
+    if [ -f "$SCRIPT_DIR/logger_daemon.py" ]; then
+        cp "$SCRIPT_DIR/logger_daemon.py" "$DAEMON_FILE"
+        chmod +x "$DAEMON_FILE"
+        print_success "Daemon installed to $DAEMON_FILE"
+    fi
 }
 
 backup_settings() {
@@ -217,13 +225,17 @@ print_completion_info() {
     echo "  3. Check your logs:"
     echo "     📁 Main log: ~/.claude/user-inputs-log.txt"
     echo "     📅 Daily logs: ~/.claude/hooks/user-inputs-YYYY-MM-DD.log"
-    echo "     📊 Statistics: ~/.claude/hooks/user-input-stats.json"
+    echo "     📊 Statistics: ~/.claude/hooks/user-input-stats.json (updated by --compact, see below)"
     echo ""
     print_info "Quick commands:"
     echo "  🔍 View recent messages:"
     echo "     grep \"User Context:\" ~/.claude/user-inputs-log.txt | tail -5"
     echo ""
+    echo "  ⚡ Optional: keep log files open in a background daemon:"
+    echo "     nohup ~/.claude/hooks/logger_daemon.py > /dev/null 2>&1 &"
+    echo ""
     echo "  📈 View statistics (requires jq):"
+    echo "     python3 ~/.claude/hooks/log-user-inputs.py --compact"
     echo "     cat ~/.claude/hooks/user-input-stats.json | jq ."
     echo ""
     echo -e "${GREEN}Happy logging! 🎉${NC}"
@@ -232,7 +244,7 @@ print_completion_info() {
 print_uninstall_info() {
     echo ""
     print_info "To uninstall:"
-    echo "  1. Remove hook: rm ~/.claude/hooks/log-user-inputs.py"
+    echo "  1. Remove hook: rm ~/.claude/hooks/log-user-inputs.py ~/.claude/hooks/logger_daemon.py"
     echo "  2. Edit ~/.claude/settings.json to remove hook configuration"
     echo "  3. Restart Claude Code"
 }
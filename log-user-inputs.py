@@ -4,11 +4,194 @@ Optimized User Input Logger for Claude Code.
 Captures user messages with duplicate detection and clean formatting.
 Only logs actual user input, no noise.
 """
-import json
+import os
 import sys
-from datetime import datetime
+import time
+
+DAEMON_SOCKET_PATH = os.path.join(os.path.expanduser('~'), '.claude', 'hooks', 'logger.sock')
+
+# Seconds the hook and the daemon wait on each other before giving up
+DAEMON_TIMEOUT = 0.5
+
+# One-byte daemon replies: event accepted, or payload is not valid JSON
+DAEMON_ACK = b'+'
+DAEMON_NACK = b'-'
+
+
+def forward_to_daemon(raw_input):
+    """
+    Hand the raw payload to a running logger_daemon.py.
+    Returns True if the daemon accepted it, False if it rejected it as invalid JSON,
+    or None if no daemon answered and the event must be handled in-process.
+    """
+    # Most setups run without the daemon; one stat and nothing else then
+    if not os.path.exists(DAEMON_SOCKET_PATH):
+        return None
+    try:
+        # The C module directly: the socket wrapper module alone costs several ms to import
+        import _socket
+        client = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    except (ImportError, AttributeError, OSError):
+        return None
+    try:
+        # A stalled daemon must never hang the tool call; a timeout falls back to in-process
+        client.settimeout(DAEMON_TIMEOUT)
+        client.connect(DAEMON_SOCKET_PATH)
+        # Events are newline-framed and stamped with the time they happened; raw
+        # newlines in JSON are only insignificant whitespace
+        client.sendall(b'%.6f\t' % time.time() + raw_input.strip().replace(b'\n', b' ') + b'\n')
+        client.shutdown(_socket.SHUT_WR)
+        reply = client.recv(1)
+    except OSError:
+        return None
+    finally:
+        client.close()
+    if reply == DAEMON_ACK:
+        return True
+    if reply == DAEMON_NACK:
+        return False
+    return None
+
+
+# Fast path: with a daemon listening the hook is only a client. Forward stdin and
+# exit before importing everything the in-process path below needs.
+_RAW_INPUT = None
+if __name__ == "__main__" and not sys.argv[1:]:
+    _RAW_INPUT = sys.stdin.buffer.read()
+    if not _RAW_INPUT.strip():
+        sys.exit(0)
+    _VERDICT = forward_to_daemon(_RAW_INPUT)
+    if _VERDICT is False:
+        print("Error: Invalid JSON input", file=sys.stderr)
+        sys.exit(1)
+    if _VERDICT:
+        sys.exit(0)
+
+import functools
+import hashlib
+import json
+import re
+import struct
+from collections import deque
 from pathlib import Path
 
+# State files are read and written as bytes; json.loads accepts them directly
+loads = json.loads
+
+
+def dumps(obj):
+    """Serialize state compactly; it is machine-read (use `jq .` to view it)."""
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+
+# Log and state file locations, resolved once per process
+CLAUDE_DIR = Path.home() / '.claude'
+HOOKS_DIR = CLAUDE_DIR / 'hooks'
+MAIN_LOG_FILE = CLAUDE_DIR / 'user-inputs-log.txt'
+STATS_FILE = HOOKS_DIR / 'user-input-stats.json'
+STATS_LOG_FILE = HOOKS_DIR / 'user-input-stats.log'
+STATS_LOCK_FILE = HOOKS_DIR / 'user-input-stats.lock'
+RECENT_MESSAGES_FILE = HOOKS_DIR / 'recent-messages.json'
+OFFSET_CACHE_FILE = HOOKS_DIR / 'offset-cache.json'
+LAST_SEEN_FILE = HOOKS_DIR / 'last-seen.bin'
+
+# Fold the append-only stats log into STATS_FILE once it grows past this
+STATS_COMPACT_BYTES = 1024 * 1024
+
+# Transcript path hash, size and mtime_ns from the previous run
+LAST_SEEN_FORMAT = struct.Struct('<QQq')
+
+# Only the end of the transcript is ever inspected, so never read more than this
+TAIL_BYTES = 64 * 1024
+TAIL_LINES = 20
+
+# Cheap substring tests to skip non-user lines before paying for a JSON parse
+USER_ENTRY_MARKER = b'"type":"user"'
+USER_ENTRY_MARKER_SPACED = b'"type": "user"'
+
+# Transcript "user" entries that Claude Code generates itself rather than the user
+SKIP_PREFIXES = ('<command-', 'Stop hook feedback', '[Request interrupted', 'Caveat:')
+SKIP_PREFIX_RE = re.compile('|'.join(map(re.escape, SKIP_PREFIXES)))
+
+# Hook payload fields that may carry user input directly
+USER_CONTEXT_FIELDS = frozenset((
+    'user_message', 'message', 'prompt', 'input', 'context',
+    'user_input', 'query', 'request', 'content', 'text',
+    'user_context', 'conversation_context',
+))
+
+# Number of recent messages remembered for duplicate detection
+RECENT_MESSAGES_LIMIT = 20
+
+# Number of transcripts remembered in the offset cache
+OFFSET_CACHE_ENTRIES = 32
+
+
+def read_transcript_tail(transcript_path, offset=0, max_bytes=TAIL_BYTES, max_lines=TAIL_LINES):
+    """
+    Return the last complete lines written after offset, plus the offset just past them.
+    Never reads more than max_bytes from the end of the file.
+    """
+    with open(transcript_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        # Start one byte early so a seek landing on a line boundary loses nothing
+        start = max(offset, size - max_bytes - 1)
+        f.seek(start)
+        tail = f.read()
+
+    # Anything after the last newline is a line still being written; leave it for next time
+    line_end = tail.rfind(b'\n')
+    end = start + line_end + 1
+    # First line is cut in half by the seek (or empty on a boundary)
+    floor = tail.find(b'\n') if start > offset else -1
+    
+    # Walk backwards so only the lines actually returned are sliced out
+    lines = []
+    while line_end > floor and len(lines) < max_lines:
+        line_start = tail.rfind(b'\n', max(floor, 0), line_end) + 1
+        line = tail[line_start:line_end]
+        if line.strip():
+            lines.append(line)
+        line_end = line_start - 1
+    lines.reverse()
+    return lines, end
+
+
+def load_offset_cache():
+    """Load per-transcript read offsets and messages from previous runs."""
+    try:
+        if OFFSET_CACHE_FILE.exists():
+            with open(OFFSET_CACHE_FILE, 'rb') as f:
+                cache = loads(f.read())
+            if isinstance(cache, dict):
+                return cache
+    except Exception:
+        pass
+    return {}
+
+
+def valid_offset_entry(entry):
+    """Check that an offset cache entry has the shape written by extract_user_messages_from_transcript."""
+    return (isinstance(entry, dict)
+            and all(type(entry.get(key)) is int for key in ('size', 'mtime_ns', 'offset'))
+            and isinstance(entry.get('messages'), list)
+            and all(isinstance(message, str) for message in entry['messages']))
+
+
+def save_offset_cache(cache):
+    """Save per-transcript read offsets for the next run."""
+    try:
+        # Keep only the most recently read transcripts
+        for path in list(cache)[:-OFFSET_CACHE_ENTRIES]:
+            del cache[path]
+        # Replace atomically so concurrent hooks never read a truncated cache
+        temp_file = OFFSET_CACHE_FILE.with_name(f"{OFFSET_CACHE_FILE.name}.{os.getpid()}.tmp")
+        with open(temp_file, 'wb') as f:
+            f.write(dumps(cache))
+        os.replace(temp_file, OFFSET_CACHE_FILE)
+    except Exception:
+        pass
+
 
 def extract_user_messages_from_transcript(transcript_path, session_id):
     """
@@ -17,17 +200,34 @@ def extract_user_messages_from_transcript(transcript_path, session_id):
     user_messages = []
     
     try:
-        if not Path(transcript_path).exists():
-            return user_messages
-            
-        # Read the last few lines of the JSONL file to get recent messages
-        with open(transcript_path, 'r') as f:
-            lines = f.readlines()
-            
-        # Check last 20 lines for user messages
-        for line in lines[-20:]:
+        st = os.stat(transcript_path)
+    except OSError:
+        return user_messages
+    
+    # Reuse what previous runs already parsed: nothing to do if the file is
+    # unchanged, otherwise only the bytes appended since then are read
+    offset_cache = load_offset_cache()
+    cached = offset_cache.pop(transcript_path, None)
+    if not valid_offset_entry(cached):
+        # Missing or damaged entry: treat as a cache miss
+        cached = None
+    if cached and cached['size'] == st.st_size and cached['mtime_ns'] == st.st_mtime_ns:
+        return cached['messages']
+    
+    offset = 0
+    if cached and cached['size'] <= st.st_size:
+        offset = cached['offset']
+        user_messages = list(cached['messages'])
+    # Otherwise the transcript was truncated or replaced, start over
+    
+    try:
+        # Check the last few lines of the JSONL file for user messages
+        lines, offset = read_transcript_tail(transcript_path, offset)
+        for line in lines:
+            if USER_ENTRY_MARKER not in line and USER_ENTRY_MARKER_SPACED not in line:
+                continue
             try:
-                entry = json.loads(line.strip())
+                entry = loads(line)
                 
                 # Look for user messages in Claude Code transcript format
                 if entry.get('type') == 'user':
@@ -35,37 +235,38 @@ def extract_user_messages_from_transcript(transcript_path, session_id):
                     message_obj = entry.get('message', {})
                     content = message_obj.get('content', '')
                     
-                    text_content = ''
-                    
-                    # Handle different content formats
-                    if isinstance(content, str):
+                    # Handle different content formats; anything else is not typed text
+                    if type(content) is str:
                         # Direct string format: "content": "message text"
-                        text_content = content
-                    elif isinstance(content, list) and len(content) > 0:
+                        text = content
+                    elif type(content) is list and content and type(content[0]) is dict:
                         # Array format: "content": [{"type": "text", "text": "message text"}]
-                        if isinstance(content[0], dict):
-                            text_content = content[0].get('text', '')
-                        else:
-                            text_content = str(content[0])
+                        text = content[0].get('text') or ''
+                    else:
+                        continue
                     
-                    if text_content and isinstance(text_content, str):
-                        # Clean up command messages and system messages
-                        text = text_content.strip()
-                        
-                        # Skip command messages and system messages
-                        if (not text.startswith('<command-') and 
-                            not text.startswith('Stop hook feedback') and
-                            not text.startswith('[Request interrupted') and
-                            len(text) > 10):  # Skip very short messages
-                            user_messages.append(text)
+                    # Clean up, then skip command messages, system messages and very short messages
+                    text = text.strip()
+                    if len(text) <= 10 or SKIP_PREFIX_RE.match(text):
+                        continue
+                    user_messages.append(text)
                         
             except (json.JSONDecodeError, KeyError, AttributeError):
                 continue
                 
+        user_messages = user_messages[-3:]  # Keep last 3 messages
+        offset_cache[transcript_path] = {
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+            'offset': offset,
+            'messages': user_messages,
+        }
+        save_offset_cache(offset_cache)
+                
     except Exception:
         pass
         
-    return user_messages[-3:] if user_messages else []  # Return last 3 messages
+    return user_messages[-3:]  # Return last 3 messages
 
 
 def extract_user_context(input_data):
@@ -73,10 +274,11 @@ def extract_user_context(input_data):
     Extract potential user input/context from the JSON data and transcript.
     """
     user_context = {}
+    get = input_data.get
     
     # Try to get user messages from transcript
-    transcript_path = input_data.get('transcript_path')
-    session_id = input_data.get('session_id', '')
+    transcript_path = get('transcript_path')
+    session_id = get('session_id', '')
     
     if transcript_path and session_id:
         recent_messages = extract_user_messages_from_transcript(transcript_path, session_id)
@@ -84,113 +286,299 @@ def extract_user_context(input_data):
             user_context['recent_user_messages'] = recent_messages
     
     # Still check for any direct user fields in the JSON
-    potential_user_fields = [
-        'user_message', 'message', 'prompt', 'input', 'context', 
-        'user_input', 'query', 'request', 'content', 'text',
-        'user_context', 'conversation_context'
-    ]
-    
-    for field in potential_user_fields:
-        if field in input_data:
-            user_context[field] = input_data[field]
+    user_context.update((field, input_data[field]) for field in input_data.keys() & USER_CONTEXT_FIELDS)
     
     return user_context
 
 
+def message_hash(message):
+    """Short fingerprint of a message, stored instead of the full text."""
+    return hashlib.blake2b(message.encode(), digest_size=8).hexdigest()
+
+
 def load_recent_messages():
-    """Load recent messages to prevent duplicates."""
-    recent_file = Path.home() / '.claude' / 'hooks' / 'recent-messages.json'
+    """Load hashes of recent messages to prevent duplicates."""
     try:
-        if recent_file.exists():
-            with open(recent_file, 'r') as f:
-                return json.load(f)
+        if RECENT_MESSAGES_FILE.exists():
+            with open(RECENT_MESSAGES_FILE, 'rb') as f:
+                recent = loads(f.read())
+            # Older versions stored the full messages as a plain list
+            if isinstance(recent, list):
+                return [message_hash(message) for message in recent]
+            return recent.get('hashes', [])
     except Exception:
         pass
     return []
 
 
-def save_recent_messages(messages):
-    """Save recent messages for duplicate detection."""
-    recent_file = Path.home() / '.claude' / 'hooks' / 'recent-messages.json'
+def save_recent_messages(hashes):
+    """Save recent message hashes for duplicate detection."""
     try:
-        # Keep only last 20 messages
-        messages = messages[-20:] if len(messages) > 20 else messages
-        with open(recent_file, 'w') as f:
-            json.dump(messages, f)
+        with open(RECENT_MESSAGES_FILE, 'wb') as f:
+            f.write(dumps({'hashes': list(hashes)}))
     except Exception:
         pass
 
 
-def main():
+def transcript_fingerprint(transcript_path):
+    """Pack the transcript's path hash, size and mtime, or None if it can't be stat'ed."""
+    try:
+        st = os.stat(transcript_path)
+    except (OSError, TypeError, ValueError):
+        return None
+    path_hash = hashlib.blake2b(transcript_path.encode(), digest_size=8).digest()
+    return LAST_SEEN_FORMAT.pack(int.from_bytes(path_hash, 'little'), st.st_size, st.st_mtime_ns)
+
+
+def load_last_seen():
+    """Load the transcript fingerprint recorded by the previous run."""
+    try:
+        with open(LAST_SEEN_FILE, 'rb') as f:
+            return f.read(LAST_SEEN_FORMAT.size)
+    except Exception:
+        return None
+
+
+def save_last_seen(fingerprint):
+    """Record the transcript fingerprint for the next run."""
+    try:
+        with open(LAST_SEEN_FILE, 'wb') as f:
+            f.write(fingerprint)
+    except Exception:
+        pass
+
+
+@functools.lru_cache(maxsize=16)
+def ensure_dir(path):
+    """Create a directory once per process; later calls for the same path are free."""
+    os.makedirs(path, exist_ok=True)
+
+
+def open_append(path):
+    """Open a file for appending with a raw O_APPEND descriptor."""
+    flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+    try:
+        return os.open(str(path), flags, 0o644)
+    except FileNotFoundError:
+        # The directory was removed after ensure_dir() cached it; recreate it
+        os.makedirs(os.path.dirname(str(path)), exist_ok=True)
+        return os.open(str(path), flags, 0o644)
+
+
+def write_chunks(fd, chunks):
+    """Write byte chunks to a descriptor with a single gather write."""
+    if hasattr(os, 'writev'):
+        os.writev(fd, chunks)
+    else:
+        os.write(fd, b''.join(chunks))
+
+
+def append_to_file(path, chunks):
+    """Append byte chunks to a file with a single gather write on an O_APPEND descriptor."""
+    fd = open_append(path)
+    try:
+        write_chunks(fd, chunks)
+    finally:
+        os.close(fd)
+
+
+def write_log_entries(log_entries, today):
+    """Append log entries to the main log and the daily log for today."""
+    # Main user inputs log
     try:
-        # Read input
-        input_data = json.load(sys.stdin)
+        append_to_file(MAIN_LOG_FILE, log_entries)
+    except Exception as e:
+        print(f"Warning: Could not write to user inputs log: {e}", file=sys.stderr)
+    
+    # Daily log
+    daily_log = HOOKS_DIR / f"user-inputs-{today}.log"
+    try:
+        append_to_file(daily_log, log_entries)
+    except Exception:
+        pass
+
+
+def valid_statistics(stats):
+    """Check that the statistics have the shape written by compact_statistics."""
+    tools = stats.get('tools_triggered', {}) if isinstance(stats, dict) else None
+    return (isinstance(tools, dict)
+            and all(type(stats.get(key, 0)) is int for key in ('total_interactions', 'user_messages_logged'))
+            and all(type(count) is int for count in tools.values()))
+
+
+def load_statistics():
+    """Load the JSON statistics, setting aside a file that can't be parsed."""
+    stats = {}
+    if STATS_FILE.exists():
+        try:
+            with open(STATS_FILE, 'rb') as f:
+                stats = loads(f.read())
+        except ValueError:
+            stats = None
+        if not valid_statistics(stats):
+            # Keep the damaged file for inspection instead of failing every compaction
+            os.replace(STATS_FILE, STATS_FILE.with_name(STATS_FILE.name + '.corrupt'))
+            stats = {}
+    stats['total_interactions'] = stats.get('total_interactions', 0)
+    stats['tools_triggered'] = stats.get('tools_triggered', {})
+    stats['user_messages_logged'] = stats.get('user_messages_logged', 0)
+    return stats
+
+
+def compact_statistics(wait=False):
+    """Fold the append-only stats log into the JSON statistics file."""
+    try:
+        import fcntl
+    except ImportError:
+        fcntl = None
+    
+    ensure_dir(str(HOOKS_DIR))
+    # Opened without truncating: the lock file also holds the names of the logs
+    # being folded, for recovering from a run that died before removing them
+    with open(STATS_LOCK_FILE, 'a+b') as lock:
+        if fcntl:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX if wait else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                # Another run is already compacting
+                return
         
-        # Extract basic info
-        tool_name = input_data.get('tool_name', 'unknown')
-        session_id = input_data.get('session_id', 'unknown')
-        project_path = input_data.get('cwd', 'unknown')
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        # Fixed name: only the lock holder writes it, and a leftover one shows an unfinished run
+        temp_file = STATS_FILE.with_name(STATS_FILE.name + '.tmp')
         
-        # Extract potential user context
-        user_context = extract_user_context(input_data)
+        # With the lock held, any *.compacting file was left by a run that died mid-way.
+        # If that run got as far as replacing the JSON (its temp file is gone), the
+        # files it listed in the lock file are already counted and only need removing.
+        lock.seek(0)
+        already_folded = set(lock.read().decode(errors='replace').split('\n'))
+        if temp_file.exists():
+            temp_file.unlink()
+            already_folded = set()
         
-        # Only proceed if we have actual user messages
-        if user_context and 'recent_user_messages' in user_context:
-            user_messages = user_context['recent_user_messages']
-            
-            # Load recent messages for duplicate detection
-            recent_messages = load_recent_messages()
-            
-            # Filter out duplicates and process each message
-            new_messages = []
-            for message in user_messages:
-                if message not in recent_messages:
-                    new_messages.append(message)
-                    recent_messages.append(message)
-                    
-                    # Clean log format with project path
-                    log_entry = f"[{timestamp}] [{session_id[:8]}] [{project_path}] {message}\n"
-                    
-                    # Main user inputs log
-                    log_file = Path.home() / '.claude' / 'user-inputs-log.txt'
-                    try:
-                        with open(log_file, 'a') as f:
-                            f.write(log_entry)
-                    except Exception as e:
-                        print(f"Warning: Could not write to user inputs log: {e}", file=sys.stderr)
-                    
-                    # Daily log
-                    daily_log = Path.home() / '.claude' / 'hooks' / f"user-inputs-{datetime.now().strftime('%Y-%m-%d')}.log"
+        stats = load_statistics()
+        pending_files = []
+        for path in HOOKS_DIR.glob(STATS_LOG_FILE.name + '.*.compacting'):
+            if path.name in already_folded:
+                path.unlink()
+            else:
+                pending_files.append(path)
+        
+        # Move the log aside under a name unique to this run so concurrent hooks start a fresh one
+        claimed_file = STATS_LOG_FILE.with_name(
+            f"{STATS_LOG_FILE.name}.{os.getpid()}-{os.urandom(4).hex()}.compacting")
+        try:
+            os.replace(STATS_LOG_FILE, claimed_file)
+            pending_files.append(claimed_file)
+        except FileNotFoundError:
+            pass
+        
+        if not pending_files:
+            return
+        
+        for path in pending_files:
+            with open(path, 'rb') as f:
+                for line in f:
                     try:
-                        daily_log.parent.mkdir(exist_ok=True)
-                        with open(daily_log, 'a') as f:
-                            f.write(log_entry)
-                    except Exception:
-                        pass
-            
-            # Save updated recent messages if we had new ones
-            if new_messages:
-                save_recent_messages(recent_messages)
-                
-                # Track statistics only for new user messages
-                stats_file = Path.home() / '.claude' / 'hooks' / 'user-input-stats.json'
-                try:
-                    stats = {}
-                    if stats_file.exists():
-                        with open(stats_file, 'r') as f:
-                            stats = json.load(f)
+                        _, tool_name, message_count = line.decode().rstrip('\n').split('\t')
+                        message_count = int(message_count)
+                    except ValueError:
+                        continue
                     
                     # Track only meaningful interactions with user input
-                    stats['total_interactions'] = stats.get('total_interactions', 0) + 1
-                    stats['tools_triggered'] = stats.get('tools_triggered', {})
+                    stats['total_interactions'] += 1
                     stats['tools_triggered'][tool_name] = stats['tools_triggered'].get(tool_name, 0) + 1
-                    stats['user_messages_logged'] = stats.get('user_messages_logged', 0) + len(new_messages)
-                    
-                    with open(stats_file, 'w') as f:
-                        json.dump(stats, f, indent=2)
-                except Exception:
-                    pass
+                    stats['user_messages_logged'] += message_count
+        
+        # Replace atomically so a crash never leaves half-written JSON behind
+        with open(temp_file, 'wb') as f:
+            f.write(dumps(stats))
+        lock.truncate(0)
+        lock.write('\n'.join(path.name for path in pending_files).encode())
+        lock.flush()
+        os.replace(temp_file, STATS_FILE)
+        
+        for path in pending_files:
+            path.unlink()
+        lock.truncate(0)
+
+
+def process_event(input_data, write_entries=write_log_entries, event_time=None):
+    """
+    Log new user messages for one hook event.
+    write_entries(log_entries, today) lets the daemon reuse its open log files,
+    and event_time lets it log when the event happened rather than when it ran.
+    """
+    get = input_data.get
+    # Every state and log file lives under the hooks directory
+    ensure_dir(str(HOOKS_DIR))
+    
+    # Bursts of tool calls often fire before the transcript changes; nothing new to log then
+    fingerprint = transcript_fingerprint(get('transcript_path'))
+    if fingerprint and fingerprint == load_last_seen():
+        return
+    
+    # Extract basic info
+    tool_name = get('tool_name', 'unknown')
+    session_id = get('session_id', 'unknown')
+    project_path = get('cwd', 'unknown')
+    now = time.localtime(event_time)
+    timestamp = (f"{now.tm_year:04d}-{now.tm_mon:02d}-{now.tm_mday:02d} "
+                 f"{now.tm_hour:02d}:{now.tm_min:02d}:{now.tm_sec:02d}")
+    today = timestamp[:10]
+    
+    # Extract potential user context
+    user_context = extract_user_context(input_data)
+    
+    # Only proceed if we have actual user messages
+    if user_context and 'recent_user_messages' in user_context:
+        user_messages = user_context['recent_user_messages']
+        
+        # Load recent message hashes for duplicate detection, oldest evicted first
+        recent_hashes = deque(load_recent_messages(), maxlen=RECENT_MESSAGES_LIMIT)
+        seen_hashes = set(recent_hashes)
+        
+        # Filter out duplicates and collect log entries for new messages
+        new_messages = []
+        log_entries = []
+        for message in user_messages:
+            digest = message_hash(message)
+            if digest not in seen_hashes:
+                seen_hashes.add(digest)
+                new_messages.append(message)
+                recent_hashes.append(digest)
+                
+                # Clean log format with project path
+                log_entries.append(f"[{timestamp}] [{session_id[:8]}] [{project_path}] {message}\n".encode())
+        
+        if log_entries:
+            write_entries(log_entries, today)
+        
+        # Save updated recent messages if we had new ones
+        if new_messages:
+            save_recent_messages(recent_hashes)
+            
+            # Track statistics only for new user messages: one appended line per
+            # interaction, folded into the JSON file once the log grows large
+            try:
+                append_to_file(STATS_LOG_FILE, [f"{timestamp}\t{tool_name}\t{len(new_messages)}\n".encode()])
+                if os.path.getsize(STATS_LOG_FILE) > STATS_COMPACT_BYTES:
+                    compact_statistics()
+            except Exception:
+                pass
+    
+    if fingerprint:
+        save_last_seen(fingerprint)
+
+
+def main():
+    try:
+        # Read input in one go as bytes (unless the fast path already did);
+        # an empty payload carries nothing to log
+        raw_input = _RAW_INPUT if _RAW_INPUT is not None else sys.stdin.buffer.read()
+        if not raw_input.strip():
+            return
+        
+        process_event(loads(raw_input))
         
     except json.JSONDecodeError:
         print("Error: Invalid JSON input", file=sys.stderr)
@@ -202,4 +590,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if '--compact' in sys.argv[1:]:
+        compact_statistics(wait=True)
+    else:
+        main()
\ No newline at end of file
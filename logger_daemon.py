@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Background companion for the User Input Logger hook.
+Keeps the log files open and processes hook events sent over a Unix socket,
+so each hook run only has to forward its payload and exit.
+"""
+import importlib.util
+import os
+import signal
+import socket
+import sys
+from pathlib import Path
+
+# The hook file name has dashes, so it is loaded by path instead of imported
+_spec = importlib.util.spec_from_file_location(
+    'log_user_inputs', Path(__file__).resolve().with_name('log-user-inputs.py'))
+hook = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(hook)
+
+_MAIN_FD = None
+_DAILY_FD = None
+_DAILY_DAY = None
+
+
+def is_unlinked(fd):
+    """Check whether a held descriptor's file was deleted or rotated away."""
+    return os.fstat(fd).st_nlink == 0
+
+
+def write_log_entries(log_entries, today):
+    """Append log entries through the held descriptors, reopening them on date change or removal."""
+    global _MAIN_FD, _DAILY_FD, _DAILY_DAY
+
+    # Main user inputs log
+    try:
+        if _MAIN_FD is not None and is_unlinked(_MAIN_FD):
+            os.close(_MAIN_FD)
+            _MAIN_FD = None
+        if _MAIN_FD is None:
+            _MAIN_FD = hook.open_append(hook.MAIN_LOG_FILE)
+        hook.write_chunks(_MAIN_FD, log_entries)
+    except Exception as e:
+        print(f"Warning: Could not write to user inputs log: {e}", file=sys.stderr)
+
+    # Daily log
+    try:
+        if _DAILY_FD is not None and (today != _DAILY_DAY or is_unlinked(_DAILY_FD)):
+            os.close(_DAILY_FD)
+            _DAILY_FD = None
+        if _DAILY_FD is None:
+            _DAILY_FD = hook.open_append(hook.HOOKS_DIR / f"user-inputs-{today}.log")
+            _DAILY_DAY = today
+        hook.write_chunks(_DAILY_FD, log_entries)
+    except Exception:
+        pass
+
+
+def receive_events(conn):
+    """Read the newline-framed hook events on one connection and acknowledge them."""
+    # A client that never finishes sending must not block everyone queued behind it
+    conn.settimeout(hook.DAEMON_TIMEOUT)
+    chunks = []
+    try:
+        while True:
+            chunk = conn.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    except socket.timeout:
+        print("Warning: Dropped a hook connection that stalled", file=sys.stderr)
+        return []
+
+    events = []
+    valid = True
+    for line in b''.join(chunks).split(b'\n'):
+        if not line.strip():
+            continue
+        # Each event is "<unix time>\t<hook JSON payload>"
+        event_time, _, payload = line.partition(b'\t')
+        try:
+            events.append((float(event_time), hook.loads(payload)))
+        except ValueError:
+            valid = False
+
+    # Reply before processing so the hook can exit right away, with status 1 on bad JSON
+    try:
+        conn.sendall(hook.DAEMON_ACK if valid else hook.DAEMON_NACK)
+    except OSError:
+        pass
+    return events
+
+
+def process_events(events):
+    """Log the received hook events through the held log descriptors."""
+    # The hooks directory may have been removed since the last event; let
+    # process_event() recreate it instead of trusting the cached ensure_dir()
+    hook.ensure_dir.cache_clear()
+
+    for event_time, input_data in events:
+        try:
+            hook.process_event(input_data, write_log_entries, event_time)
+        except Exception as e:
+            # One bad event must not take the daemon down
+            print(f"Warning: User input logging error: {e}", file=sys.stderr)
+
+
+def daemon_running():
+    """Check whether another daemon is already listening on the socket."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            probe.settimeout(hook.DAEMON_TIMEOUT)
+            probe.connect(hook.DAEMON_SOCKET_PATH)
+        return True
+    except OSError:
+        return False
+
+
+def main():
+    if daemon_running():
+        print(f"Logger daemon already listening on {hook.DAEMON_SOCKET_PATH}", file=sys.stderr)
+        sys.exit(1)
+
+    hook.ensure_dir(str(hook.HOOKS_DIR))
+    # Left behind by a daemon that did not shut down cleanly
+    try:
+        os.unlink(hook.DAEMON_SOCKET_PATH)
+    except FileNotFoundError:
+        pass
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # Create the socket owner-only from the start, never world-connectable
+    old_umask = os.umask(0o077)
+    try:
+        server.bind(hook.DAEMON_SOCKET_PATH)
+    finally:
+        os.umask(old_umask)
+    server.listen(16)
+
+    # Let a plain `kill` run the cleanup below too
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    try:
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                events = receive_events(conn)
+            process_events(events)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        try:
+            os.unlink(hook.DAEMON_SOCKET_PATH)
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    main()